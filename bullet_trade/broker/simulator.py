@@ -6,13 +6,63 @@
 
 from __future__ import annotations
 
-import asyncio
-import uuid
+import logging
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
 
 from .base import BrokerBase
 
+logger = logging.getLogger(__name__)
+
+# numba 为可选依赖：可用时对成交记账内核做 JIT 编译，否则按纯 Python 执行
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - 仅在缺少 numba 时触发
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):  # type: ignore[no-redef]
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _apply_buy(amounts, avg_costs, idx, amount, trade_price):
+    """买入记账：更新槽位数量与加权平均成本"""
+    old_amount = amounts[idx]
+    new_amount = old_amount + amount
+    avg_costs[idx] = (old_amount * avg_costs[idx] + amount * trade_price) / new_amount
+    amounts[idx] = new_amount
+
+
+@njit(cache=True)
+def _apply_sell(amounts, idx, amount):
+    """卖出记账：扣减槽位数量（清仓后槽位保留，数量为 0）"""
+    amounts[idx] -= amount
+
+
+def _check_amount(amount: float) -> None:
+    """委托数量必须为正整数（股数），否则拒单"""
+    if not 0 < amount < np.inf or amount != int(amount):
+        raise ValueError(f"委托数量无效: {amount}")
+
+
+def _check_amounts(raw: np.ndarray) -> None:
+    """批量版本的 _check_amount，任一数量无效时整批拒绝"""
+    bad = ~((raw > 0) & np.isfinite(raw)) | (raw != np.floor(raw))
+    if bad.any():
+        raise ValueError(f"委托数量无效: {raw[bad][0]}")
+
+
+def _export_order(order: Dict[str, Any]) -> Dict[str, Any]:
+    """订单对外输出：将内部纳秒时间戳转换为 datetime"""
+    return {**order, "time": datetime.fromtimestamp(order["time"] / 1e9)}
+
 
 class SimulatorBroker(BrokerBase):
     """
@@ -22,6 +72,11 @@ class SimulatorBroker(BrokerBase):
     可用于策略测试和开发
     """
 
+    # 模拟费率，子类可覆盖
+    COMMISSION_RATE = 0.0003  # 买卖双向佣金
+    STAMP_DUTY = 0.001  # 卖出印花税
+    DEFAULT_MOCK_PRICE = 10.0  # 无 mock 价格时的默认成交价
+
     def __init__(
         self,
         account_id: str = "simulator",
@@ -29,54 +84,133 @@ class SimulatorBroker(BrokerBase):
         initial_cash: float = 1_000_000,
     ):
         super().__init__(account_id, account_type)
+        self._buy_cost_factor = 1 + self.COMMISSION_RATE
+        self._sell_net_factor = 1 - self.COMMISSION_RATE - self.STAMP_DUTY
         self.initial_cash = initial_cash
         self.available_cash = initial_cash
-        self.positions: Dict[str, Dict[str, float]] = {}
+        # 持仓按结构化数组（SoA）存放：证券代码 -> 槽位下标，数量/成本/行情各占一列
+        self._sym_idx: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._amounts = np.zeros(0, dtype=np.int64)
+        self._avg_costs = np.zeros(0, dtype=np.float64)
+        self._prices = np.zeros(0, dtype=np.float64)  # NaN 表示无 mock 价格
+        # 持仓/行情变更时置脏，查询时才重建持仓快照
+        self._positions_dirty = True
+        self._cached_positions: List[Dict[str, Any]] = []
+        self._cached_positions_value = 0.0
         self.orders: Dict[str, Dict[str, Any]] = {}
         self.trades: List[Dict[str, Any]] = []
         self._mock_prices: Dict[str, float] = {}
+        self._tick_dt_iso: Dict[str, str] = {}
+        self._next_order_id = 0
+        self._tick_iso_cache: Tuple[int, str] = (0, "")
 
     def connect(self) -> bool:
         """连接（模拟）"""
         self._connected = True
-        print("模拟券商已连接")
+        logger.info("模拟券商已连接")
         return True
 
     def disconnect(self) -> bool:
         """断开连接（模拟）"""
         self._connected = False
-        print("模拟券商已断开")
+        logger.info("模拟券商已断开")
         return True
 
+    @property
+    def positions(self) -> Mapping[str, Mapping[str, float]]:
+        """
+        持仓快照：{security: {"amount": ..., "avg_cost": ...}}
+
+        返回只读视图，写入会抛出 TypeError；持仓只能通过下单改变。
+        """
+        n = len(self._symbols)
+        held = np.flatnonzero(self._amounts[:n])
+        return MappingProxyType(
+            {
+                self._symbols[i]: MappingProxyType({"amount": amount, "avg_cost": avg_cost})
+                for i, amount, avg_cost in zip(
+                    held.tolist(),
+                    self._amounts[held].tolist(),
+                    self._avg_costs[held].tolist(),
+                )
+            }
+        )
+
+    def _slot(self, security: str) -> int:
+        """返回证券的槽位下标，不存在时分配；数组容量按 2 的幂扩容。"""
+        idx = self._sym_idx.get(security)
+        if idx is not None:
+            return idx
+        idx = len(self._symbols)
+        capacity = len(self._amounts)
+        if idx >= capacity:
+            new_capacity = max(8, capacity * 2)
+            self._amounts = self._grow(self._amounts, new_capacity, 0)
+            self._avg_costs = self._grow(self._avg_costs, new_capacity, 0.0)
+            self._prices = self._grow(self._prices, new_capacity, np.nan)
+        self._sym_idx[security] = idx
+        self._symbols.append(security)
+        self._prices[idx] = self._mock_prices.get(security, np.nan)
+        return idx
+
+    @staticmethod
+    def _grow(arr: np.ndarray, capacity: int, fill: float) -> np.ndarray:
+        grown = np.full(capacity, fill, dtype=arr.dtype)
+        grown[: len(arr)] = arr
+        return grown
+
+    def _valuation_prices(self, n: int) -> np.ndarray:
+        """估值价格：有 mock 价格取 mock 价，否则取持仓成本"""
+        prices = self._prices[:n]
+        return np.where(np.isnan(prices), self._avg_costs[:n], prices)
+
+    def _refresh_positions(self) -> None:
+        """持仓或行情有变动时重建持仓快照与持仓市值"""
+        if not self._positions_dirty:
+            return
+        # 先清标记再读数组：重建期间若有成交（如 sync_account 在工作线程执行），
+        # 标记会被重新置脏，下次查询再重建，不会丢失更新
+        self._positions_dirty = False
+        n = len(self._symbols)
+        amounts = self._amounts[:n]
+        prices = self._valuation_prices(n)
+        held = np.flatnonzero(amounts)
+        symbols = self._symbols
+        # 一次性转成 Python 列表再组装，避免逐元素读取 NumPy 标量
+        self._cached_positions = [
+            {
+                "security": symbols[i],
+                "amount": amount,
+                "avg_cost": avg_cost,
+                "current_price": price,
+                "market_value": amount * price,
+            }
+            for i, amount, avg_cost, price in zip(
+                held.tolist(),
+                amounts[held].tolist(),
+                self._avg_costs[held].tolist(),
+                prices[held].tolist(),
+            )
+        ]
+        self._cached_positions_value = float(np.dot(amounts, prices))
+
     def get_account_info(self) -> Dict[str, Any]:
         """获取账户信息"""
-        positions_value = sum(
-            pos["amount"] * self._mock_prices.get(sec, pos["avg_cost"])
-            for sec, pos in self.positions.items()
-        )
+        self._refresh_positions()
+        positions_value = self._cached_positions_value
         return {
             "account_id": self.account_id,
             "total_value": self.available_cash + positions_value,
             "available_cash": self.available_cash,
             "positions_value": positions_value,
-            "positions": self.get_positions(),
+            "positions": list(self._cached_positions),
         }
 
     def get_positions(self) -> List[Dict[str, Any]]:
-        """获取持仓"""
-        result: List[Dict[str, Any]] = []
-        for security, pos in self.positions.items():
-            price = self._mock_prices.get(security, pos["avg_cost"])
-            result.append(
-                {
-                    "security": security,
-                    "amount": pos["amount"],
-                    "avg_cost": pos["avg_cost"],
-                    "current_price": price,
-                    "market_value": pos["amount"] * price,
-                }
-            )
-        return result
+        """获取持仓（返回缓存快照的浅拷贝，持仓条目请勿原地修改）"""
+        self._refresh_positions()
+        return list(self._cached_positions)
 
     async def buy(
         self,
@@ -87,37 +221,71 @@ class SimulatorBroker(BrokerBase):
         *,
         market: bool = False,
     ) -> str:
-        """买入：在后台线程执行以避免阻塞事件循环"""
-        return await asyncio.to_thread(self._buy_sync, security, amount, price, market)
+        """买入：纯内存撮合，直接在事件循环内执行，避免线程切换开销"""
+        return self._buy_sync(security, amount, price, market)
+
+    def _now_iso(self) -> str:
+        """当前时间的 ISO 字符串，按毫秒量化缓存，同一毫秒内不重复格式化"""
+        now_ns = time.time_ns()
+        key = now_ns // 1_000_000
+        if key != self._tick_iso_cache[0]:
+            self._tick_iso_cache = (key, datetime.fromtimestamp(now_ns / 1e9).isoformat())
+        return self._tick_iso_cache[1]
+
+    def _new_order_id(self) -> str:
+        """生成本地唯一的订单号（单调递增计数器）"""
+        self._next_order_id += 1
+        return f"{self._next_order_id:08x}"
+
+    def _record_order(
+        self,
+        order_id: str,
+        security: str,
+        amount: int,
+        trade_price: float,
+        side: str,
+        market: bool,
+        time_ns: int,
+    ) -> None:
+        self.orders[order_id] = {
+            "order_id": order_id,
+            "security": security,
+            "amount": amount,
+            "price": trade_price,
+            "side": side,
+            "market": market,
+            "status": "filled",
+            "time": time_ns,  # 纳秒时间戳，对外输出时转换为 datetime
+        }
 
     def _buy_sync(self, security: str, amount: int, price: Optional[float], market: bool) -> str:
-        order_id = str(uuid.uuid4())[:8]
-        trade_price = price if price is not None else self._mock_prices.get(security, 10.0)
+        _check_amount(amount)
+        amount = int(amount)
+        trade_price = (
+            price if price is not None else self._mock_prices.get(security, self.DEFAULT_MOCK_PRICE)
+        )
 
-        cost = amount * trade_price * 1.0003  # 模拟手续费
+        cost = amount * trade_price * self._buy_cost_factor  # 模拟手续费
         if cost > self.available_cash:
             raise ValueError(f"可用资金不足: {self.available_cash:.2f} < {cost:.2f}")
 
-        if security not in self.positions:
-            self.positions[security] = {"amount": 0, "avg_cost": 0}
-
-        pos = self.positions[security]
-        total_cost = pos["amount"] * pos["avg_cost"] + amount * trade_price
-        pos["amount"] += amount
-        pos["avg_cost"] = total_cost / pos["amount"]
+        order_id = self._new_order_id()
+        idx = self._slot(security)
+        _apply_buy(self._amounts, self._avg_costs, idx, amount, float(trade_price))
+        self._positions_dirty = True
         self.available_cash -= cost
 
-        self.orders[order_id] = {
-            "order_id": order_id,
-            "security": security,
-            "amount": amount,
-            "price": trade_price,
-            "side": "buy",
-            "market": bool(market or price is None),
-            "status": "filled",
-            "time": datetime.now(),
-        }
-        print(f"模拟买入成功: {security} x {amount} @ {trade_price:.2f}")
+        self._record_order(
+            order_id,
+            security,
+            amount,
+            trade_price,
+            "buy",
+            bool(market or price is None),
+            time.time_ns(),
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("模拟买入成功: %s x %d @ %.2f", security, amount, trade_price)
         return order_id
 
     async def sell(
@@ -130,37 +298,146 @@ class SimulatorBroker(BrokerBase):
         market: bool = False,
     ) -> str:
         """卖出"""
-        return await asyncio.to_thread(self._sell_sync, security, amount, price, market)
+        return self._sell_sync(security, amount, price, market)
 
     def _sell_sync(self, security: str, amount: int, price: Optional[float], market: bool) -> str:
-        order_id = str(uuid.uuid4())[:8]
+        _check_amount(amount)
+        amount = int(amount)
 
-        if security not in self.positions or self.positions[security]["amount"] < amount:
+        idx = self._sym_idx.get(security)
+        if idx is None or self._amounts[idx] < amount:
             raise ValueError(f"持仓不足: {security}")
 
-        trade_price = price if price is not None else self._mock_prices.get(security, 10.0)
+        trade_price = (
+            price if price is not None else self._mock_prices.get(security, self.DEFAULT_MOCK_PRICE)
+        )
 
-        pos = self.positions[security]
-        pos["amount"] -= amount
-        if pos["amount"] == 0:
-            del self.positions[security]
+        order_id = self._new_order_id()
+        _apply_sell(self._amounts, idx, amount)
+        self._positions_dirty = True
 
-        proceeds = amount * trade_price * (1 - 0.0003 - 0.001)
+        proceeds = amount * trade_price * self._sell_net_factor
         self.available_cash += proceeds
 
-        self.orders[order_id] = {
-            "order_id": order_id,
-            "security": security,
-            "amount": amount,
-            "price": trade_price,
-            "side": "sell",
-            "market": bool(market or price is None),
-            "status": "filled",
-            "time": datetime.now(),
-        }
-        print(f"模拟卖出成功: {security} x {amount} @ {trade_price:.2f}")
+        self._record_order(
+            order_id,
+            security,
+            amount,
+            trade_price,
+            "sell",
+            bool(market or price is None),
+            time.time_ns(),
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("模拟卖出成功: %s x %d @ %.2f", security, amount, trade_price)
         return order_id
 
+    # ----- 批量下单 -----
+
+    async def buy_many(self, orders: Sequence[Tuple[str, int, Optional[float]]]) -> List[str]:
+        """
+        批量买入：orders 为 (security, amount, price) 序列，price 为 None 时按市价撮合。
+
+        整批共用一个时间戳，资金不足时整批拒绝，不会部分成交。
+        """
+        return self._buy_many_sync(orders)
+
+    async def sell_many(self, orders: Sequence[Tuple[str, int, Optional[float]]]) -> List[str]:
+        """批量卖出：参数同 buy_many，任一证券持仓不足时整批拒绝。"""
+        return self._sell_many_sync(orders)
+
+    def _batch_prices(self, idx: np.ndarray, given: Sequence[Optional[float]]) -> np.ndarray:
+        """未指定价格的订单取 mock 价，无 mock 价时取 DEFAULT_MOCK_PRICE"""
+        prices = np.array([np.nan if p is None else p for p in given], dtype=np.float64)
+        missing = np.isnan(prices)
+        if missing.any():
+            fallback = self._prices[idx[missing]]
+            prices[missing] = np.where(np.isnan(fallback), self.DEFAULT_MOCK_PRICE, fallback)
+        return prices
+
+    def _buy_many_sync(self, orders: Sequence[Tuple[str, int, Optional[float]]]) -> List[str]:
+        if not orders:
+            return []
+        raw = np.fromiter((o[1] for o in orders), dtype=np.float64, count=len(orders))
+        _check_amounts(raw)
+        amounts = raw.astype(np.int64)
+        securities = [o[0] for o in orders]
+        idx = np.fromiter(map(self._slot, securities), dtype=np.int64, count=len(orders))
+        given = [o[2] for o in orders]
+        prices = self._batch_prices(idx, given)
+
+        notional = amounts * prices
+        costs = notional * self._buy_cost_factor  # 模拟手续费
+        total_cost = float(costs.sum())
+        if total_cost > self.available_cash:
+            raise ValueError(f"可用资金不足: {self.available_cash:.2f} < {total_cost:.2f}")
+
+        # 同一证券可能在批次中出现多次，先按槽位聚合再更新
+        uniq, inverse = np.unique(idx, return_inverse=True)
+        add_amounts = np.bincount(inverse, weights=amounts).astype(np.int64)
+        add_notional = np.bincount(inverse, weights=notional)
+        old_amounts = self._amounts[uniq]
+        new_amounts = old_amounts + add_amounts
+        self._avg_costs[uniq] = (old_amounts * self._avg_costs[uniq] + add_notional) / new_amounts
+        self._amounts[uniq] = new_amounts
+        self._positions_dirty = True
+        self.available_cash -= total_cost
+
+        now_ns = time.time_ns()
+        order_ids: List[str] = []
+        for security, amount, price, trade_price in zip(
+            securities, amounts.tolist(), given, prices.tolist()
+        ):
+            order_id = self._new_order_id()
+            self._record_order(
+                order_id, security, amount, trade_price, "buy", price is None, now_ns
+            )
+            order_ids.append(order_id)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("模拟批量买入成功: %d 笔，共 %.2f", len(order_ids), total_cost)
+        return order_ids
+
+    def _sell_many_sync(self, orders: Sequence[Tuple[str, int, Optional[float]]]) -> List[str]:
+        if not orders:
+            return []
+        raw = np.fromiter((o[1] for o in orders), dtype=np.float64, count=len(orders))
+        _check_amounts(raw)
+        amounts = raw.astype(np.int64)
+        securities = [o[0] for o in orders]
+        for security in securities:
+            if security not in self._sym_idx:
+                raise ValueError(f"持仓不足: {security}")
+        idx = np.fromiter(
+            map(self._sym_idx.__getitem__, securities), dtype=np.int64, count=len(orders)
+        )
+
+        uniq, inverse = np.unique(idx, return_inverse=True)
+        sub_amounts = np.bincount(inverse, weights=amounts).astype(np.int64)
+        short = self._amounts[uniq] < sub_amounts
+        if short.any():
+            raise ValueError(f"持仓不足: {self._symbols[int(uniq[short][0])]}")
+
+        given = [o[2] for o in orders]
+        prices = self._batch_prices(idx, given)
+        proceeds = float((amounts * prices).sum() * self._sell_net_factor)
+        self._amounts[uniq] -= sub_amounts
+        self._positions_dirty = True
+        self.available_cash += proceeds
+
+        now_ns = time.time_ns()
+        order_ids: List[str] = []
+        for security, amount, price, trade_price in zip(
+            securities, amounts.tolist(), given, prices.tolist()
+        ):
+            order_id = self._new_order_id()
+            self._record_order(
+                order_id, security, amount, trade_price, "sell", price is None, now_ns
+            )
+            order_ids.append(order_id)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("模拟批量卖出成功: %d 笔，共 %.2f", len(order_ids), proceeds)
+        return order_ids
+
     async def cancel_order(self, order_id: str) -> bool:
         """撤销订单"""
         if order_id in self.orders:
@@ -170,11 +447,20 @@ class SimulatorBroker(BrokerBase):
 
     async def get_order_status(self, order_id: str) -> Dict[str, Any]:
         """获取订单状态"""
-        return self.orders.get(order_id, {})
+        order = self.orders.get(order_id)
+        return _export_order(order) if order is not None else {}
 
     def set_mock_price(self, security: str, price: float) -> None:
         """设置模拟行情价格"""
         self._mock_prices[security] = price
+        self._set_slot_price(security, price)
+        self._tick_dt_iso[security] = self._now_iso()
+
+    def _set_slot_price(self, security: str, price: float) -> None:
+        idx = self._sym_idx.get(security)
+        if idx is not None:
+            self._prices[idx] = price
+            self._positions_dirty = True
 
     # ----- LiveEngine 钩子 -----
 
@@ -190,7 +476,7 @@ class SimulatorBroker(BrokerBase):
 
     def sync_orders(self) -> List[Dict[str, Any]]:
         """返回当前订单列表"""
-        return list(self.orders.values())
+        return [_export_order(order) for order in self.orders.values()]
 
     def supports_tick_subscription(self) -> bool:
         """模拟券商允许订阅 tick（基于自定义价格）"""
@@ -199,7 +485,10 @@ class SimulatorBroker(BrokerBase):
     def subscribe_ticks(self, symbols: List[str]) -> None:
         """tick 订阅占位实现：预置一个默认价格，避免上层报错。"""
         for sym in symbols:
-            self._mock_prices.setdefault(sym, 10.0)
+            if sym not in self._mock_prices:
+                self._mock_prices[sym] = self.DEFAULT_MOCK_PRICE
+                self._set_slot_price(sym, self.DEFAULT_MOCK_PRICE)
+                self._tick_dt_iso[sym] = self._now_iso()
 
     def subscribe_markets(self, markets: List[str]) -> None:
         """市场级订阅在模拟券商中忽略即可。"""
@@ -209,18 +498,35 @@ class SimulatorBroker(BrokerBase):
         """取消订阅（清理 mock 价格），允许 symbols 为空表示全部。"""
         if symbols is None:
             self._mock_prices.clear()
+            self._tick_dt_iso.clear()
+            self._prices[:] = np.nan
+            self._positions_dirty = True
             return None
         for sym in symbols:
             self._mock_prices.pop(sym, None)
+            self._tick_dt_iso.pop(sym, None)
+            self._set_slot_price(sym, np.nan)
         return None
 
     def get_current_tick(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """根据 mock price 生成简易 tick"""
+        """根据 mock price 生成简易 tick（时间戳取价格最近一次更新的时间）"""
         price = self._mock_prices.get(symbol)
         if price is None:
             return None
+        dt = self._tick_dt_iso.get(symbol)
+        if dt is None:
+            dt = self._now_iso()
         return {
             "sid": symbol,
             "last_price": price,
-            "dt": datetime.now().isoformat(),
+            "dt": dt,
         }
+
+    def get_current_ticks(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """批量获取 tick，无 mock 价格的标的不返回"""
+        result: Dict[str, Dict[str, Any]] = {}
+        for symbol in symbols:
+            tick = self.get_current_tick(symbol)
+            if tick is not None:
+                result[symbol] = tick
+        return result
@@ -15,7 +15,7 @@ BulletTrade 命令行主入口
 import os
 import sys
 import argparse
-from pathlib import Path
+import importlib
 from typing import Dict, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -30,7 +30,7 @@ def apply_cli_overrides(args, logger: Optional["Logger"] = None) -> Dict[str, st
 
     log_dir = getattr(args, 'log_dir', None)
     if log_dir:
-        resolved = str(Path(log_dir).expanduser().resolve())
+        resolved = os.path.realpath(os.path.expanduser(log_dir))
         os.environ['LOG_DIR'] = resolved
         if logger is None:
             from bullet_trade.core.globals import log as global_log
@@ -39,7 +39,7 @@ def apply_cli_overrides(args, logger: Optional["Logger"] = None) -> Dict[str, st
 
     runtime_dir = getattr(args, 'runtime_dir', None)
     if runtime_dir:
-        resolved = str(Path(runtime_dir).expanduser().resolve())
+        resolved = os.path.realpath(os.path.expanduser(runtime_dir))
         os.environ['RUNTIME_DIR'] = resolved
         overrides['runtime_dir'] = resolved
 
@@ -62,61 +62,25 @@ def _refresh_env_dependents() -> None:
         pass
 
 
-def create_parser():
-    """创建命令行参数解析器"""
-    parser = argparse.ArgumentParser(
-        prog='bullet-trade',
-        description='BulletTrade - 专业的量化交易系统',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-示例:
-  # 运行回测
-  bullet-trade backtest strategy.py --start 2023-01-01 --end 2023-12-31 --output backtest_results/demo
+class _VersionAction(argparse.Action):
+    """--version：仅在实际请求时才读取版本号，避免每次启动都导入。"""
 
-  # 实盘
-  bullet-trade live strategy.py --broker qmt --runtime-dir runtime/live --log-dir logs/live
+    def __init__(
+        self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help=None
+    ):
+        super().__init__(
+            option_strings=option_strings, dest=dest, default=default, nargs=0, help=help
+        )
 
-  # 服务端
-  bullet-trade server --server-type qmt --listen 0.0.0.0 --port 8080
-
-  # 研究环境 (JupyterLab)
-  bullet-trade lab
+    def __call__(self, parser, namespace, values, option_string=None):
+        # 从单一来源读取版本号
+        from bullet_trade.__version__ import __version__
+        print(f'{parser.prog} {__version__}')
+        parser.exit()
 
-  # 切换 env 文件
-  bullet-trade --env-file .env.dev backtest strategy.py --start 2023-01-01 --end 2023-12-31
-
-  # 参数优化
-  bullet-trade optimize strategy.py --params params.json --start 2023-01-01 --end 2023-12-31 --output optimization.csv --processes 4
-
-  更多信息请访问: https://github.com/BulletTrade/bullet-trade
-               https://bullettrade.cn/
-        """
-    )
-    
-    # 从单一来源读取版本号
-    from bullet_trade.__version__ import __version__
-    parser.add_argument(
-        '--version',
-        action='version',
-        version=f'%(prog)s {__version__}'
-    )
 
-    # 全局 env 文件参数（对所有子命令生效）
-    parser.add_argument(
-        '--env-file',
-        dest='env_file',
-        default=None,
-        help='指定要加载的 .env 文件（优先于默认搜索）'
-    )
-    
-    subparsers = parser.add_subparsers(
-        title='commands',
-        description='可用命令',
-        dest='command',
-        help='命令帮助'
-    )
-    
-    # backtest 命令
+def _add_backtest_parser(subparsers) -> None:
+    """backtest 命令"""
     backtest_parser = subparsers.add_parser(
         'backtest',
         help='运行策略回测'
@@ -233,8 +197,10 @@ def create_parser():
         default=None,
         help='报告标题（默认使用输出目录名称）'
     )
-    
-    # optimize 命令
+
+
+def _add_optimize_parser(subparsers) -> None:
+    """optimize 命令"""
     optimize_parser = subparsers.add_parser(
         'optimize',
         help='参数优化'
@@ -274,8 +240,10 @@ def create_parser():
         default='./optimization_results.csv',
         help='输出CSV文件路径'
     )
-    
-    # live 命令（待实现）
+
+
+def _add_live_parser(subparsers) -> None:
+    """live 命令"""
     live_parser = subparsers.add_parser(
         'live',
         help='实盘交易'
@@ -305,7 +273,9 @@ def create_parser():
         help='覆盖 RUNTIME_DIR，优先于 .env'
     )
 
-    # report 命令
+
+def _add_report_parser(subparsers) -> None:
+    """report 命令"""
     report_parser = subparsers.add_parser(
         'report',
         help='根据回测结果目录生成标准化报告'
@@ -348,9 +318,10 @@ def create_parser():
         default=None,
         help='报告标题'
     )
-    
 
-    # server 命令
+
+def _add_server_parser(subparsers) -> None:
+    """server 命令"""
     server_parser = subparsers.add_parser(
         'server',
         help='启动远程数据/券商服务'
@@ -483,7 +454,9 @@ def create_parser():
         help='关闭请求访问日志'
     )
 
-    # jupyterlab / lab 命令
+
+def _add_lab_parser(subparsers) -> None:
+    """jupyterlab / lab 命令"""
     lab_parser = subparsers.add_parser(
         'lab',
         aliases=['jupyterlab'],
@@ -501,12 +474,118 @@ def create_parser():
     lab_parser.add_argument('--keyfile', dest='keyfile', default=None, help='TLS 私钥路径')
     lab_parser.add_argument('--allow-origin', dest='allow_origin', default=None, help='允许的跨域来源')
     lab_parser.add_argument('--diagnose', dest='diagnose', action='store_true', help='仅做依赖/端口诊断，不启动服务')
+
+
+# 子命令 -> 子解析器注册函数（lab 与 jupyterlab 为同一命令的别名）
+_SUBPARSER_FACTORIES = {
+    'backtest': _add_backtest_parser,
+    'optimize': _add_optimize_parser,
+    'live': _add_live_parser,
+    'report': _add_report_parser,
+    'server': _add_server_parser,
+    'lab': _add_lab_parser,
+    'jupyterlab': _add_lab_parser,
+}
+
+
+def _peek_command(argv) -> Optional[str]:
+    """在完整解析前预读子命令名；跳过全局选项及其取值。"""
+    skip_next = False
+    for arg in argv:
+        if skip_next:
+            skip_next = False
+            continue
+        if arg == '--env-file':
+            skip_next = True
+            continue
+        if arg.startswith('-'):
+            continue
+        return arg if arg in _SUBPARSER_FACTORIES else None
+    return None
+
+
+def create_parser(command: Optional[str] = None):
+    """
+    创建命令行参数解析器
+
+    指定 command 时只注册该子命令（加快启动）；未指定或无法识别时注册全部子命令，
+    以便 --help 与错误提示保持完整。
+    """
+    parser = argparse.ArgumentParser(
+        prog='bullet-trade',
+        description='BulletTrade - 专业的量化交易系统',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 运行回测
+  bullet-trade backtest strategy.py --start 2023-01-01 --end 2023-12-31 --output backtest_results/demo
+
+  # 实盘
+  bullet-trade live strategy.py --broker qmt --runtime-dir runtime/live --log-dir logs/live
+
+  # 服务端
+  bullet-trade server --server-type qmt --listen 0.0.0.0 --port 8080
+
+  # 研究环境 (JupyterLab)
+  bullet-trade lab
+
+  # 切换 env 文件
+  bullet-trade --env-file .env.dev backtest strategy.py --start 2023-01-01 --end 2023-12-31
+
+  # 参数优化
+  bullet-trade optimize strategy.py --params params.json --start 2023-01-01 --end 2023-12-31 --output optimization.csv --processes 4
+
+  更多信息请访问: https://github.com/BulletTrade/bullet-trade
+               https://bullettrade.cn/
+        """
+    )
+    
+    parser.add_argument(
+        '--version',
+        action=_VersionAction,
+        help='显示版本号并退出'
+    )
+
+    # 全局 env 文件参数（对所有子命令生效）
+    parser.add_argument(
+        '--env-file',
+        dest='env_file',
+        default=None,
+        help='指定要加载的 .env 文件（优先于默认搜索）'
+    )
+    
+    subparsers = parser.add_subparsers(
+        title='commands',
+        description='可用命令',
+        dest='command',
+        help='命令帮助'
+    )
+
+    factory = _SUBPARSER_FACTORIES.get(command) if command else None
+    if factory is not None:
+        factory(subparsers)
+    else:
+        for name, factory in _SUBPARSER_FACTORIES.items():
+            if name != 'jupyterlab':
+                factory(subparsers)
     return parser
 
 
+# 子命令 -> (处理模块, 入口函数)
+_COMMANDS = {
+    'backtest': ('bullet_trade.cli.backtest', 'run_backtest'),
+    'optimize': ('bullet_trade.cli.optimize', 'run_optimize'),
+    'report': ('bullet_trade.cli.report', 'run_report'),
+    'live': ('bullet_trade.cli.live', 'run_live'),
+    'server': ('bullet_trade.server.cli', 'run_server_command'),
+    'lab': ('bullet_trade.cli.jupyterlab', 'run_lab'),
+    'jupyterlab': ('bullet_trade.cli.jupyterlab', 'run_lab'),
+}
+
+
 def main():
     """主函数"""
-    parser = create_parser()
+    parser = create_parser(_peek_command(sys.argv[1:]))
     args = parser.parse_args()
     # 若提供 env 文件，覆盖加载一次，便于区分客户端/服务端环境
     try:
@@ -522,29 +601,16 @@ def main():
         parser.print_help()
         return 0
     
-    # 导入命令处理模块
-    if args.command == 'backtest':
-        from .backtest import run_backtest
-        return run_backtest(args)
-    elif args.command == 'optimize':
-        from .optimize import run_optimize
-        return run_optimize(args)
-    elif args.command == 'report':
-        from .report import run_report
-        return run_report(args)
-    elif args.command == 'live':
-        from .live import run_live
-        return run_live(args, live_config_override=(overrides or None))
-    elif args.command == 'server':
-        from bullet_trade.server.cli import run_server_command
-        return run_server_command(args)
-    elif args.command in ('lab', 'jupyterlab'):
-        from bullet_trade.cli.jupyterlab import run_lab
-
-        return run_lab(args)
-    else:
+    # 导入命令处理模块（延迟导入，仅加载实际执行的命令）
+    target = _COMMANDS.get(args.command)
+    if target is None:
         print(f"未知命令: {args.command}")
         return 1
+    module_name, func_name = target
+    handler = getattr(importlib.import_module(module_name), func_name)
+    if args.command == 'live':
+        return handler(args, live_config_override=(overrides or None))
+    return handler(args)
 
 
 if __name__ == '__main__':
@@ -180,6 +180,9 @@ class Logger:
             else:
                 directory = os.path.abspath(os.path.expanduser(log_dir or "."))
                 target_path = os.path.join(directory, "app.log")
+            if self._file_handler is not None and self._file_handler.baseFilename == target_path:
+                # 目标文件未变化，无需重新打开文件句柄
+                return
             os.makedirs(directory, exist_ok=True)
             fh = RotatingFileHandler(
                 target_path,
@@ -311,6 +314,10 @@ class Logger:
             return msg
 
 
+    def isEnabledFor(self, level: int) -> bool:
+        """判断指定级别的日志是否会输出（与标准 logging 接口一致），便于跳过昂贵的格式化"""
+        return self.logger.isEnabledFor(level)
+
     def debug(self, msg: str, *args, **kwargs):
         """输出DEBUG级别日志"""
         self.logger.debug(self._format_message(msg), *args, **kwargs)
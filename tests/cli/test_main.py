@@ -3,6 +3,8 @@ import sys
 from pathlib import Path
 from types import SimpleNamespace
 
+import pytest
+
 
 from bullet_trade.cli.main import apply_cli_overrides
 from bullet_trade.core.globals import Logger
@@ -86,3 +88,58 @@ def test_apply_cli_overrides_sets_runtime_override(tmp_path, monkeypatch):
     expected = str(runtime_dir.resolve())
     assert overrides['runtime_dir'] == expected
     assert os.environ['RUNTIME_DIR'] == expected
+
+
+def test_version_flag_prints_version(capsys):
+    from bullet_trade.__version__ import __version__
+    from bullet_trade.cli.main import create_parser
+
+    parser = create_parser()
+    with pytest.raises(SystemExit) as exc:
+        parser.parse_args(['--version'])
+    assert exc.value.code == 0
+    assert __version__ in capsys.readouterr().out
+
+
+def test_create_parser_registers_only_requested_command():
+    from bullet_trade.cli.main import _peek_command, create_parser
+
+    argv = ['--env-file', 'custom.env', 'report', '--input', 'results']
+    command = _peek_command(argv)
+    assert command == 'report'
+
+    args = create_parser(command).parse_args(argv)
+    assert args.command == 'report'
+    assert args.input == 'results'
+    assert args.env_file == 'custom.env'
+
+    assert _peek_command(['--help']) is None
+    assert _peek_command(['unknown']) is None
+
+
+def test_main_dispatches_to_command_handler(monkeypatch):
+    import bullet_trade.cli.main as main_mod
+    import bullet_trade.cli.report as report_mod
+
+    received = {}
+
+    def fake_run_report(args):
+        received['input'] = args.input
+        return 7
+
+    monkeypatch.setattr(report_mod, "run_report", fake_run_report)
+    monkeypatch.setattr(sys, "argv", ["bullet-trade", "report", "--input", "results"])
+
+    assert main_mod.main() == 7
+    assert received['input'] == "results"
+
+
+def test_apply_cli_overrides_keeps_handler_for_same_log_dir(tmp_path):
+    logger = Logger()
+    args = SimpleNamespace(log_dir=str(tmp_path / "cli_logs"), runtime_dir=None)
+
+    apply_cli_overrides(args, logger=logger)
+    handler = logger._file_handler
+    apply_cli_overrides(args, logger=logger)
+
+    assert logger._file_handler is handler
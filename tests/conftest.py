@@ -5,6 +5,9 @@ Pytest 全局配置与命令行参数（tests 作用域）。
 - --live-providers=jqdata,tushare,qmt 用于在线用例的 Provider 指定（默认 jqdata）。
 - 兼容旧用法：--requires-network / --requires-jqdata（等价于 -m 过滤），便于脚本沿用。
 
+共享夹具：
+- jq_auth：session 级 jqdatasdk 认证，读取 .env 或环境变量中的 JQDATA_* 配置，会话结束时 logout。
+
 示例：
 - 只跑联网用例并指定 jqdata：
   pytest -q -m requires_network bullet-trade/tests/unit/test_exec_and_dividends_reference.py --live-providers=jqdata
@@ -14,8 +17,29 @@ Pytest 全局配置与命令行参数（tests 作用域）。
 
 from __future__ import annotations
 
+import os
+import re
+from pathlib import Path
+
 import pytest
 
+try:
+    import jqdatasdk as _jq
+except ImportError:  # 未安装 jqdatasdk 时在 jq_auth 中跳过
+    _jq = None
+
+
+# .env 中的 KEY=VALUE 行（跳过空行、注释和不含 '=' 的行）
+_ENV_RE = re.compile(r'^[ \t]*([^#\s=][^=\n]*?)[ \t]*=(.*)$', re.M)
+
+
+def _parse_env_text(text: str) -> dict:
+    """解析 .env 文本：值原样保留（不处理行内注释与变量展开），仅去掉首尾空白和引号"""
+    return {
+        key: value.strip().strip('"').strip("'")
+        for key, value in _ENV_RE.findall(text)
+    }
+
 
 def pytest_addoption(parser: pytest.Parser) -> None:
     parser.addoption(
@@ -117,3 +141,81 @@ def _reset_core_state():
         data_api.set_current_context(None)
     except Exception:
         pass
+
+
+@pytest.fixture(scope="session")
+def jq_auth():
+    """
+    认证 jqdatasdk（整个测试会话只认证一次，各模块共享同一连接）
+    
+    从当前目录的 .env 文件读取配置，支持以下变量：
+    - JQDATA_USERNAME: 聚宽用户名（必需）
+    - JQDATA_PASSWORD: 聚宽密码（必需）
+    - JQDATA_HOST: 自定义服务器地址（可选，不填则使用聚宽官方）
+    - JQDATA_PORT: 自定义服务器端口（可选）
+    """
+    # 查找 .env 文件的可能位置
+    possible_paths = [
+        Path('.env'),                           # 当前目录
+        #Path('bullet-trade/.env'),              # bullet-trade 子目录
+        #Path(__file__).parent.parent.parent / '.env',  # tests 的上级目录
+    ]
+    
+    # 手动读取 .env 文件（直接尝试读取，不存在时换下一个候选）
+    env_vars = {}
+    env_file_found = None
+    
+    for env_path in possible_paths:
+        try:
+            text = env_path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            continue
+        env_file_found = env_path
+        print(f"\n从 {env_path.absolute()} 读取配置")
+        env_vars = _parse_env_text(text)
+        break
+    
+    if not env_file_found:
+        # 尝试从环境变量获取
+        print("\n未找到 .env 文件，尝试从环境变量获取")
+        env_vars = {
+            'JQDATA_USERNAME': os.getenv('JQDATA_USERNAME'),
+            'JQDATA_PASSWORD': os.getenv('JQDATA_PASSWORD'),
+            'JQDATA_SERVER': os.getenv('JQDATA_SERVER'),
+            'JQDATA_PORT': os.getenv('JQDATA_PORT'),
+        }
+    
+    username = env_vars.get('JQDATA_USERNAME')
+    password = env_vars.get('JQDATA_PASSWORD')
+    host = env_vars.get('JQDATA_SERVER')
+    port = env_vars.get('JQDATA_PORT')
+    
+    if not username or not password:
+        pytest.skip(
+            f"缺少 JQDATA_USERNAME 或 JQDATA_PASSWORD\n"
+            f"请在 .env 文件中配置：\n"
+            f"  JQDATA_USERNAME=你的用户名\n"
+            f"  JQDATA_PASSWORD=你的密码\n"
+            f"  JQDATA_HOST=服务器地址（可选）\n"
+            f"  JQDATA_PORT=服务器端口（可选）"
+        )
+    
+    if _jq is None:
+        pytest.skip("未安装 jqdatasdk")
+    jq = _jq
+    
+    # 如果有自定义 host/port，使用它们
+    if host and port:
+        jq.auth(username, password, host=host, port=int(port))
+        print(f"使用自定义服务器: {host}:{port}")
+    else:
+        jq.auth(username, password)
+        print("使用聚宽官方服务器")
+    
+    yield jq
+    
+    # 会话结束时关闭连接
+    try:
+        jq.logout()
+    except Exception:
+        pass
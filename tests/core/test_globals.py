@@ -59,3 +59,18 @@ def test_configure_file_logging_accepts_file_path(tmp_path, monkeypatch):
     assert handler is not None
     assert Path(handler.baseFilename) == log_file.resolve()
     assert handler.level == logging.ERROR
+
+
+def test_logger_is_enabled_for_follows_strategy_level():
+    logger = Logger()
+    original = logger.logger.level
+    handler_levels = [(h, h.level) for h in logger.logger.handlers]
+    try:
+        logger.set_level('strategy', 'warning')
+        assert not logger.isEnabledFor(logging.INFO)
+        assert logger.isEnabledFor(logging.ERROR)
+    finally:
+        logger.logger.setLevel(original)
+        for handler, level in handler_levels:
+            handler.setLevel(level)
+        logger._sync_standard_logger()
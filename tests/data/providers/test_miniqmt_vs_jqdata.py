@@ -1,6 +1,7 @@
 import datetime as dt
 from typing import Dict, Tuple
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -32,7 +33,8 @@ class FakeXtData:
         df = self.frames.get((security, dividend_type))
         if df is None:
             df = pd.DataFrame()
-        return {security: df.copy()}
+        # provider 取数后会自行 copy，这里直接返回共享帧
+        return {security: df}
 
     def get_divid_factors(self, stock_code: str, start_time: str = "", end_time: str = ""):
         return self.dividends.get(stock_code)
@@ -53,16 +55,17 @@ def _build_sample_frames():
     dates = pd.to_datetime(
         ["2025-05-20", "2025-06-11", "2025-06-12", "2025-06-13", "2025-06-30"]
     )
-    base_prices = [12.0, 12.5, 11.0, 11.5, 12.2]
+    base_prices = np.array([12.0, 12.5, 11.0, 11.5, 12.2])
     raw_df = pd.DataFrame(
         {
-            "time": [int(ts.value // 10**6) for ts in dates],
+            # 按毫秒换算，不依赖 DatetimeIndex 的内部精度（pandas 2+ 可能为 us/s）
+            "time": dates.values.astype("datetime64[ms]").astype(np.int64),
             "open": base_prices,
-            "high": [p + 0.2 for p in base_prices],
-            "low": [p - 0.2 for p in base_prices],
+            "high": base_prices + 0.2,
+            "low": base_prices - 0.2,
             "close": base_prices,
-            "volume": [1000] * len(dates),
-            "amount": [p * 1000 for p in base_prices],
+            "volume": np.full(len(dates), 1000, dtype=np.int64),
+            "amount": base_prices * 1000,
         }
     )
     front_ratio_df = pd.DataFrame(columns=raw_df.columns)
@@ -1,29 +1,59 @@
 from jqdata import *  # noqa: F401,F403
 
 import datetime as _dt
+import logging as _logging
+import os as _os
 import pandas as _pd
 
 from bullet_trade.core.exceptions import FutureDataError
 
+# 未来数据防护校验需逐个触发异常，开销较大；设置 TEMPORAL_GUARDS_ENABLED=0 可跳过
+_GUARDS_DISABLED_VALUES = {"0", "false", "no", "off"}
+_GUARDS_ENABLED = (
+    _os.getenv("TEMPORAL_GUARDS_ENABLED", "1").strip().lower() not in _GUARDS_DISABLED_VALUES
+)
 
-def _record_error(message):
-    g.errors.append(message)
+
+# 最多保留的错误条数：保留最早的错误（通常是根因），超出部分只计数
+_MAX_ERRORS = 256
+
+
+def _record_error(template, *args):
+    # 仅保存模板与参数，最终汇总时再格式化
+    if len(g.errors) >= _MAX_ERRORS:
+        g.errors_dropped += 1
+        return
+    g.errors.append((template, args))
+
+
+def _describe_exc(exc):
+    # 只保留异常的文本描述，避免异常对象连带 traceback 帧常驻内存
+    return f"{type(exc).__name__}: {exc}"
+
+
+def _format_errors(errors, dropped=0):
+    lines = [template % args if args else template for template, args in errors]
+    if dropped:
+        lines.append(f"……另有 {dropped} 条错误超出上限 {_MAX_ERRORS} 未记录")
+    return lines
 
 
 def _expect_future_error(label, func, *args, **kwargs):
+    if not _GUARDS_ENABLED:
+        return
     try:
         func(*args, **kwargs)
     except FutureDataError:
         return
     except Exception as exc:
-        _record_error(f"{label} 返回异常: {exc}")
+        _record_error("%s 返回异常: %s", label, _describe_exc(exc))
     else:
-        _record_error(f"{label} 未触发 FutureDataError")
+        _record_error("%s 未触发 FutureDataError", label)
 
 
 def _expect_type(label, value, types):
     if not isinstance(value, types):
-        _record_error(f"{label} 类型不符合预期: {type(value)}")
+        _record_error("%s 类型不符合预期: %s", label, type(value))
 
 
 def _summarize_value(value):
@@ -42,10 +72,18 @@ def _summarize_value(value):
 def _safe_call(label, func, *args, **kwargs):
     try:
         result = func(*args, **kwargs)
-        log.info("[数据API] %s args=%s kwargs=%s result=%s", label, args, kwargs, _summarize_value(result))
+        # 结果摘要需要实际读取 DataFrame，仅在 INFO 可输出时才生成
+        if log.isEnabledFor(_logging.INFO):
+            log.info(
+                "[数据API] %s args=%s kwargs=%s result=%s",
+                label,
+                args,
+                kwargs,
+                _summarize_value(result),
+            )
         return result
     except Exception as exc:
-        _record_error(f"{label} 调用失败: {exc}")
+        _record_error("%s 调用失败: %s", label, _describe_exc(exc))
         return None
 
 
@@ -54,7 +92,8 @@ def initialize(context):
     set_option('use_real_price', True)
     set_data_provider('jqdata')
     set_universe(['000001.XSHE', '000300.XSHG'])
-    g.errors = []
+    g.errors = []  # 最多 _MAX_ERRORS 条，限制异常情况下的内存增长
+    g.errors_dropped = 0
     g.security = '000001.XSHE'
     g.index = '000300.XSHG'
     try:
@@ -223,4 +262,5 @@ def after_trading_end(context):
         )
 
     if g.errors:
-        raise AssertionError("数据 API 校验失败:\\n" + "\\n".join(g.errors))
+        details = "\\n".join(_format_errors(g.errors, g.errors_dropped))
+        raise AssertionError("数据 API 校验失败:\\n" + details)
@@ -39,6 +39,8 @@ def initialize(context):
     # 初始化股票池
     context.stock_pool = []
     context.ma_period = 5  # 均线周期
+    g.hs300_cache_key = None  # 沪深300成分股缓存
+    g.hs300_stocks = []
     
     # 每天开盘前更新股票池
     run_daily(before_market_open, time='before_open')
@@ -54,8 +56,13 @@ def before_market_open(context):
     Args:
         context: 策略上下文
     """
-    # 获取沪深300成分股
-    hs300_stocks = get_index_stocks('000300.XSHG')
+    # 获取沪深300成分股：成分股仅在 6 月、12 月定期调整，其余月份按月缓存
+    today = context.current_dt.date()
+    cache_key = (today.year, today.month) if today.month not in (6, 12) else today
+    if g.hs300_cache_key != cache_key:
+        g.hs300_stocks = get_index_stocks('000300.XSHG')
+        g.hs300_cache_key = cache_key
+    hs300_stocks = g.hs300_stocks
     
     # 获取过去20天的成交额数据
     # 注意：
@@ -72,11 +79,20 @@ def before_market_open(context):
     )
     
     if df is not None and not df.empty:
-        # 计算平均成交额
-        avg_money = df.groupby('code')['money'].mean()
+        # 计算平均成交额：按代码分桶求和/计数（忽略 NaN，与 groupby.mean 一致）
+        codes, inverse = np.unique(df['code'].to_numpy(), return_inverse=True)
+        money = df['money'].to_numpy(dtype='float64')
+        valid = ~np.isnan(money)
+        sums = np.bincount(inverse, weights=np.where(valid, money, 0.0), minlength=len(codes))
+        counts = np.bincount(inverse, weights=valid, minlength=len(codes))
+        has_data = counts > 0
+        codes = codes[has_data]
+        values = sums[has_data] / counts[has_data]
         
-        # 选择成交额最大的前10只股票
-        context.stock_pool = avg_money.nlargest(10).index.tolist()
+        # 选择成交额最大的前10只股票：codes 已按代码排序，稳定排序使并列时按代码先后取，
+        # 与 Series.nlargest(10, keep='first') 结果一致
+        idx = np.argsort(-values, kind='stable')[:10]
+        context.stock_pool = codes[idx].tolist()
         
         log.info(f"更新股票池: {context.stock_pool}")
 
@@ -88,34 +104,44 @@ def market_open(context):
     Args:
         context: 策略上下文
     """
-    # 获取当前持仓
-    current_positions = list(context.portfolio.positions.keys())
+    if not context.stock_pool:
+        return
+    
+    # 获取当前持仓与总资产（循环内复用，避免每只股票重复计算）
+    current_positions = set(context.portfolio.positions)
+    total_value = context.portfolio.total_value
+    
+    # 一次性获取股票池全部历史数据（需要足够的数据计算均线），避免逐只请求
+    # 注意：盘中不能获取当日的 close 字段数据（聚宽限制）
+    # 因此使用 end_date=context.previous_date，确保不包含当日数据
+    df_all = get_price(
+        context.stock_pool,
+        end_date=context.previous_date,  # 使用前一交易日作为结束日期
+        count=context.ma_period + 1,
+        fields=['close'],
+        panel=False  # 返回包含 code 列的 DataFrame
+    )
+    if df_all is None or df_all.empty:
+        return
+    frames = dict(tuple(df_all.groupby('code', sort=False)))
+    
+    period = context.ma_period
     
     # 遍历股票池
     for stock in context.stock_pool:
-        # 获取历史数据（需要足够的数据计算均线）
-        # 注意：盘中不能获取当日的 close 字段数据（聚宽限制）
-        # 因此使用 end_date=context.previous_date，确保不包含当日数据
-        df = get_price(
-            stock,
-            end_date=context.previous_date,  # 使用前一交易日作为结束日期
-            count=context.ma_period + 1,
-            fields=['close']
-        )
-        
-        if df is None or len(df) < context.ma_period + 1:
+        df = frames.get(stock)
+        if df is None or len(df) < period + 1:
             continue
         
-        # 计算5日均线
-        ma5 = df['close'].rolling(window=context.ma_period).mean()
+        closes = df['close'].to_numpy(dtype='float64')
         
         # 获取当前价格和前一日价格
-        current_price = df['close'].iloc[-1]
-        prev_price = df['close'].iloc[-2]
+        current_price = closes[-1]
+        prev_price = closes[-2]
         
-        # 获取当前和前一日的均线
-        current_ma = ma5.iloc[-1]
-        prev_ma = ma5.iloc[-2]
+        # 计算当前和前一日的5日均线（只需最后两个窗口）
+        current_ma = closes[-period:].mean()
+        prev_ma = closes[-period - 1:-1].mean()
         
         # 判断是否持仓
         is_holding = stock in current_positions
@@ -123,7 +149,7 @@ def market_open(context):
         # 买入信号：前一日价格 < 前一日均线，当前价格 > 当前均线（上穿）
         if not is_holding and prev_price < prev_ma and current_price > current_ma:
             # 买入，使用10%的资金
-            order_value(stock, context.portfolio.total_value * 0.1)
+            order_value(stock, total_value * 0.1)
             log.info(f"买入信号: {stock}, 价格={current_price:.2f}, MA5={current_ma:.2f}")
         
         # 卖出信号：前一日价格 > 前一日均线，当前价格 < 当前均线（下穿）
@@ -6,12 +6,20 @@
 """
 import os
 import sys
+import functools
 import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from types import MappingProxyType, ModuleType
+from typing import Dict, Any, List, Mapping, Tuple, Union
 import pytest
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # 未编译 libyaml 时退回纯 Python 实现
+    from yaml import SafeLoader as _YamlLoader
+
 # 加载 .env 环境变量
 from bullet_trade.utils.env_loader import load_env
 
@@ -32,6 +40,8 @@ if not _jq_module or Path(getattr(_jq_module, "__file__", "")).resolve() != _loc
     assert spec.loader is not None
     spec.loader.exec_module(_jq_module)  # type: ignore[arg-type]
 sys.modules["jqdata"] = _jq_module  # type: ignore[arg-type]
+# 规范的 jqdata 模块引用，测试中按对象身份比较即可，无需重复解析路径
+_CANON_JQ = _jq_module
 
 from bullet_trade.core.engine import BacktestEngine
 
@@ -51,7 +61,7 @@ def load_config() -> Dict[str, Any]:
     
     try:
         with open(config_file, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YamlLoader)
             return config if config else {'default': get_default_config()}
     except Exception as e:
         print(f"警告: 加载配置文件失败: {e}，使用默认配置")
@@ -69,9 +79,10 @@ def discover_strategies() -> List[Tuple[str, Path]]:
     strategy_files = []
     
     if strategies_dir.exists():
-        for file_path in strategies_dir.glob('*.py'):
-            # 跳过 __init__.py、测试脚本
-            if file_path.name.startswith('__') or file_path.name.startswith('test_'):
+        for file_path in strategies_dir.iterdir():
+            name = file_path.name
+            # 仅收集 .py 文件，跳过 __init__.py、测试脚本
+            if not name.endswith('.py') or name.startswith(('__', 'test_')):
                 continue
             
             strategy_name = file_path.stem
@@ -99,6 +110,36 @@ def load_strategy_module(strategy_path: Path):
     return module
 
 
+# 模块导入时 pytest.skip()/pytest.fail() 抛出的异常不继承 Exception，需单独捕获
+_LOAD_ERRORS = (Exception, pytest.skip.Exception, pytest.fail.Exception)
+
+
+def preload_strategies(
+    strategies: List[Tuple[str, Path]],
+) -> Dict[str, Union[ModuleType, BaseException]]:
+    """
+    并行预加载策略模块（加载以 IO 为主，线程即可并行）
+    
+    Args:
+        strategies: 策略名称和文件路径的列表
+        
+    Returns:
+        Dict[str, Union[ModuleType, BaseException]]: 策略名称到模块的映射；
+            加载失败（含导入时 skip/fail）时保存异常，在对应用例中再抛出，避免影响其他策略的收集
+    """
+    def _load(item: Tuple[str, Path]):
+        name, path = item
+        try:
+            return name, load_strategy_module(path)
+        except _LOAD_ERRORS as exc:
+            return name, exc
+
+    if len(strategies) <= 1:
+        return dict(map(_load, strategies))
+    with ThreadPoolExecutor(max_workers=min(8, len(strategies))) as executor:
+        return dict(executor.map(_load, strategies))
+
+
 def get_default_config() -> Dict[str, Any]:
     """
     获取默认的策略测试配置
@@ -116,28 +157,29 @@ def get_default_config() -> Dict[str, Any]:
     }
 
 
-def get_strategy_config(strategy_name: str, all_configs: Dict[str, Any]) -> Dict[str, Any]:
+@functools.lru_cache(maxsize=None)
+def get_strategy_config(strategy_name: str) -> Mapping[str, Any]:
     """
-    获取特定策略的配置
+    获取特定策略的配置（按策略名缓存）
     
     Args:
         strategy_name: 策略名称
-        all_configs: 所有配置
         
     Returns:
-        Dict[str, Any]: 策略配置
+        Mapping[str, Any]: 策略配置（只读视图，缓存结果在多次调用间共享）
     """
+    all_configs = ALL_CONFIGS
     # 优先使用策略特定配置
     if strategy_name in all_configs:
         config = all_configs['default'].copy() if 'default' in all_configs else get_default_config()
         config.update(all_configs[strategy_name])
-        return config
+        return MappingProxyType(config)
     
     # 使用默认配置
     if 'default' in all_configs:
-        return all_configs['default'].copy()
+        return MappingProxyType(all_configs['default'].copy())
     
-    return get_default_config()
+    return MappingProxyType(get_default_config())
 
 
 def validate_results(results: Dict[str, Any], expected: Dict[str, Any]) -> List[str]:
@@ -154,26 +196,23 @@ def validate_results(results: Dict[str, Any], expected: Dict[str, Any]) -> List[
     errors = []
     
     for metric, constraints in expected.items():
-        if metric not in results:
+        actual_value = results.get(metric)
+        if actual_value is None:
             continue
-            
-        actual_value = results[metric]
+        min_value = constraints.get('min')
+        max_value = constraints.get('max')
         
         # 检查最小值约束
-        if 'min' in constraints:
-            min_value = constraints['min']
-            if actual_value < min_value:
-                errors.append(
-                    f"{metric} = {actual_value:.4f} 小于期望最小值 {min_value:.4f}"
-                )
+        if min_value is not None and actual_value < min_value:
+            errors.append(
+                f"{metric} = {actual_value:.4f} 小于期望最小值 {min_value:.4f}"
+            )
         
         # 检查最大值约束
-        if 'max' in constraints:
-            max_value = constraints['max']
-            if actual_value > max_value:
-                errors.append(
-                    f"{metric} = {actual_value:.4f} 大于期望最大值 {max_value:.4f}"
-                )
+        if max_value is not None and actual_value > max_value:
+            errors.append(
+                f"{metric} = {actual_value:.4f} 大于期望最大值 {max_value:.4f}"
+            )
     
     return errors
 
@@ -184,6 +223,9 @@ ALL_CONFIGS = load_config()
 # 发现所有策略
 STRATEGIES = discover_strategies()
 
+# 预加载所有策略模块
+LOADED_STRATEGIES = preload_strategies(STRATEGIES)
+
 
 @pytest.mark.parametrize("strategy_name,strategy_path", STRATEGIES)
 def test_strategy(strategy_name: str, strategy_path: Path):
@@ -222,20 +264,18 @@ def test_strategy(strategy_name: str, strategy_path: Path):
             pytest.skip("缺少 miniQMT/xtquant 环境，跳过直连示例")
 
     # 加载策略模块前确保 jqdata 仍指向本地兼容模块（防止被其他测试污染）
-    _local_jq_path = (project_root / "jqdata.py").resolve()
-    jq_module = sys.modules.get("jqdata")
-    if Path(getattr(jq_module, "__file__", "")).resolve() != _local_jq_path:
-        spec = importlib.util.spec_from_file_location("jqdata", _local_jq_path)
-        jq_module = importlib.util.module_from_spec(spec)
-        assert spec.loader is not None
-        spec.loader.exec_module(jq_module)  # type: ignore[arg-type]
-        sys.modules["jqdata"] = jq_module  # type: ignore[arg-type]
-
-    # 加载策略模块
-    strategy_module = load_strategy_module(strategy_path)
+    if sys.modules.get("jqdata") is not _CANON_JQ:
+        sys.modules["jqdata"] = _CANON_JQ  # type: ignore[arg-type]
+
+    # 取预加载的策略模块
+    strategy_module = LOADED_STRATEGIES.get(strategy_name)
+    if strategy_module is None:
+        strategy_module = load_strategy_module(strategy_path)
+    elif isinstance(strategy_module, BaseException):
+        raise strategy_module
     
     # 从配置文件获取策略配置（不再从策略文件读取）
-    config = get_strategy_config(strategy_name, ALL_CONFIGS)
+    config = get_strategy_config(strategy_name)
     
     print(f"\n策略配置:")
     print(f"  回测期间: {config['start_date']} ~ {config['end_date']}")
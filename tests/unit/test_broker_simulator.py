@@ -4,6 +4,8 @@
 单元测试：测试模拟券商的各项功能
 """
 
+from datetime import datetime
+
 import pytest
 from bullet_trade.broker.simulator import SimulatorBroker
 
@@ -164,3 +166,221 @@ class TestSimulatorBroker:
         # 检查状态
         order = await broker.get_order_status(order_id)
         assert order['status'] == 'cancelled'
+
+    @pytest.mark.asyncio
+    async def test_order_ids_unique(self):
+        """测试订单号唯一且递增"""
+        broker = SimulatorBroker(initial_cash=100000)
+
+        buy_id = await broker.buy('000001.XSHE', 1000, price=10.0)
+        sell_id = await broker.sell('000001.XSHE', 500, price=10.0)
+
+        assert buy_id != sell_id
+        assert len(broker.orders) == 2
+        assert int(sell_id, 16) > int(buy_id, 16)
+
+    @pytest.mark.asyncio
+    async def test_order_time_exported_as_datetime(self):
+        """测试订单时间对外输出为 datetime，批量订单共用时间戳"""
+        broker = SimulatorBroker(initial_cash=100000)
+
+        order_ids = await broker.buy_many([('000001.XSHE', 100, 10.0), ('600000.XSHG', 100, 10.0)])
+        first = await broker.get_order_status(order_ids[0])
+        synced = broker.sync_orders()
+
+        assert isinstance(first['time'], datetime)
+        assert all(o['time'] == first['time'] for o in synced)
+
+    @pytest.mark.asyncio
+    async def test_account_valuation(self):
+        """测试持仓估值：有行情用行情价，无行情用成本价"""
+        broker = SimulatorBroker(initial_cash=100000)
+        broker.set_mock_price('000001.XSHE', 12.0)
+
+        await broker.buy('000001.XSHE', 1000, price=10.0)
+        await broker.buy('600000.XSHG', 100, price=20.0)
+        info = broker.get_account_info()
+        assert info['positions_value'] == pytest.approx(1000 * 12.0 + 100 * 20.0)
+
+        broker.unsubscribe_ticks(['000001.XSHE'])
+        info = broker.get_account_info()
+        assert info['positions_value'] == pytest.approx(1000 * 10.0 + 100 * 20.0)
+
+    @pytest.mark.asyncio
+    async def test_rebuy_after_sell_all(self):
+        """测试清仓后重新买入，成本价重新计算"""
+        broker = SimulatorBroker(initial_cash=100000)
+
+        await broker.buy('000001.XSHE', 1000, price=10.0)
+        await broker.sell('000001.XSHE', 1000, price=10.0)
+        await broker.buy('000001.XSHE', 500, price=8.0)
+
+        pos = broker.positions['000001.XSHE']
+        assert pos['amount'] == 500
+        assert pos['avg_cost'] == pytest.approx(8.0)
+
+    @pytest.mark.asyncio
+    async def test_buy_many_sell_many(self):
+        """测试批量买卖，与逐笔下单结果一致"""
+        batch = SimulatorBroker(initial_cash=100000)
+        single = SimulatorBroker(initial_cash=100000)
+        for broker in (batch, single):
+            broker.set_mock_price('600000.XSHG', 20.0)
+        orders = [
+            ('000001.XSHE', 1000, 10.0),
+            ('600000.XSHG', 500, None),
+            ('000001.XSHE', 500, 12.0),
+        ]
+
+        order_ids = await batch.buy_many(orders)
+        for sec, amount, price in orders:
+            await single.buy(sec, amount, price=price)
+
+        assert len(order_ids) == 3
+        assert batch.orders[order_ids[1]]['price'] == 20.0
+        assert batch.orders[order_ids[1]]['market'] is True
+        for sec, pos in single.positions.items():
+            assert batch.positions[sec]['amount'] == pos['amount']
+            assert batch.positions[sec]['avg_cost'] == pytest.approx(pos['avg_cost'])
+        assert batch.available_cash == pytest.approx(single.available_cash)
+
+        await batch.sell_many([('000001.XSHE', 1500, 11.0), ('600000.XSHG', 100, None)])
+        await single.sell('000001.XSHE', 1500, price=11.0)
+        await single.sell('600000.XSHG', 100)
+        assert '000001.XSHE' not in batch.positions
+        assert batch.positions['600000.XSHG']['amount'] == 400
+        assert batch.available_cash == pytest.approx(single.available_cash)
+
+    @pytest.mark.asyncio
+    async def test_batch_rejected_atomically(self):
+        """测试批量下单校验失败时整批拒绝"""
+        broker = SimulatorBroker(initial_cash=10000)
+
+        with pytest.raises(ValueError, match="可用资金不足"):
+            await broker.buy_many([('000001.XSHE', 500, 10.0), ('600000.XSHG', 500, 10.0)])
+        assert broker.available_cash == 10000
+        assert not broker.positions
+        assert not broker.orders
+
+        await broker.buy('000001.XSHE', 500, price=10.0)
+        with pytest.raises(ValueError, match="持仓不足"):
+            await broker.sell_many([('000001.XSHE', 300, 10.0), ('000001.XSHE', 300, 10.0)])
+        assert broker.positions['000001.XSHE']['amount'] == 500
+
+    @pytest.mark.asyncio
+    async def test_positions_read_only(self):
+        """测试持仓视图只读：直接写入会报错，而不是被静默丢弃"""
+        broker = SimulatorBroker(initial_cash=100000)
+        await broker.buy('000001.XSHE', 100, price=10.0)
+
+        with pytest.raises(TypeError):
+            broker.positions['600000.XSHG'] = {'amount': 100, 'avg_cost': 10.0}
+        with pytest.raises(TypeError):
+            broker.positions['000001.XSHE']['amount'] = 0
+        assert broker.positions == {'000001.XSHE': {'amount': 100, 'avg_cost': 10.0}}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('amount', [0, -100, 100.7, float('nan')])
+    async def test_invalid_amount_rejected(self, amount):
+        """测试非正整数委托数量被拒绝，且不改变账户状态"""
+        broker = SimulatorBroker(initial_cash=100000)
+        await broker.buy('000001.XSHE', 100, price=10.0)
+        cash = broker.available_cash
+
+        with pytest.raises(ValueError, match="委托数量无效"):
+            await broker.buy('000001.XSHE', amount, price=10.0)
+        with pytest.raises(ValueError, match="委托数量无效"):
+            await broker.sell('000001.XSHE', amount, price=10.0)
+        with pytest.raises(ValueError, match="委托数量无效"):
+            await broker.buy_many([('600000.XSHG', 100, 10.0), ('000002.XSHE', amount, 10.0)])
+        with pytest.raises(ValueError, match="委托数量无效"):
+            await broker.sell_many([('000001.XSHE', amount, 10.0)])
+
+        assert broker.available_cash == cash
+        assert broker.positions == {'000001.XSHE': {'amount': 100, 'avg_cost': 10.0}}
+        assert len(broker.orders) == 1
+        assert broker.get_account_info()['total_value'] == pytest.approx(cash + 1000.0)
+
+    @pytest.mark.asyncio
+    async def test_numba_kernels_match_python_accounting(self):
+        """测试 numba 编译的记账内核：买入、卖出、清仓后再买入与纯 Python 路径一致"""
+        pytest.importorskip("numba")
+        from bullet_trade.broker import simulator
+
+        assert simulator.NUMBA_AVAILABLE
+        assert hasattr(simulator._apply_buy, 'py_func')  # 已被 njit 包装
+
+        broker = SimulatorBroker(initial_cash=100000)
+        await broker.buy('000001.XSHE', 1000, price=10.0)
+        await broker.buy('000001.XSHE', 1000, price=12.0)
+        assert broker.positions['000001.XSHE'] == {'amount': 2000, 'avg_cost': pytest.approx(11.0)}
+
+        await broker.sell('000001.XSHE', 2000, price=11.0)
+        assert '000001.XSHE' not in broker.positions
+
+        await broker.buy('000001.XSHE', 500, price=9.0)
+        assert broker.positions['000001.XSHE'] == {'amount': 500, 'avg_cost': pytest.approx(9.0)}
+        with pytest.raises(ValueError, match="委托数量无效"):
+            await broker.buy('000001.XSHE', 0, price=9.0)
+
+    @pytest.mark.asyncio
+    async def test_positions_snapshot_refreshed_on_change(self):
+        """测试持仓快照缓存：无变动时复用，成交或行情变动后刷新"""
+        broker = SimulatorBroker(initial_cash=100000)
+        await broker.buy('000001.XSHE', 1000, price=10.0)
+
+        first = broker.get_positions()
+        assert broker.get_positions()[0] is first[0]
+
+        broker.set_mock_price('000001.XSHE', 11.0)
+        assert broker.get_positions()[0]['current_price'] == 11.0
+        assert broker.get_account_info()['positions_value'] == pytest.approx(11000.0)
+
+        await broker.sell('000001.XSHE', 400, price=11.0)
+        assert broker.get_positions()[0]['amount'] == 600
+
+    @pytest.mark.asyncio
+    async def test_fill_during_snapshot_rebuild_not_lost(self, monkeypatch):
+        """测试快照重建期间发生成交（sync_account 在工作线程执行）时，下次查询能看到新成交"""
+        broker = SimulatorBroker(initial_cash=100000)
+        await broker.buy('000001.XSHE', 1000, price=10.0)
+
+        original = broker._valuation_prices
+
+        def _fill_midway(n):
+            prices = original(n)
+            monkeypatch.setattr(broker, '_valuation_prices', original)
+            broker._buy_sync('600000.XSHG', 100, 10.0, False)
+            return prices
+
+        monkeypatch.setattr(broker, '_valuation_prices', _fill_midway)
+        broker.sync_account()
+
+        securities = {p['security'] for p in broker.get_positions()}
+        assert securities == {'000001.XSHE', '600000.XSHG'}
+
+    def test_get_current_ticks(self):
+        """测试批量获取 tick"""
+        broker = SimulatorBroker()
+        broker.set_mock_price('000001.XSHE', 10.5)
+        broker.subscribe_ticks(['600000.XSHG'])
+
+        ticks = broker.get_current_ticks(['000001.XSHE', '600000.XSHG', '000002.XSHE'])
+
+        assert set(ticks) == {'000001.XSHE', '600000.XSHG'}
+        assert ticks['000001.XSHE']['last_price'] == 10.5
+        assert ticks['600000.XSHG']['last_price'] == 10.0
+        assert ticks['000001.XSHE']['dt']
+
+    @pytest.mark.asyncio
+    async def test_fee_rates_overridable(self):
+        """测试子类可覆盖模拟费率"""
+        class ZeroFeeBroker(SimulatorBroker):
+            COMMISSION_RATE = 0.0
+            STAMP_DUTY = 0.0
+
+        broker = ZeroFeeBroker(initial_cash=100000)
+        await broker.buy('000001.XSHE', 1000, price=10.0)
+        assert broker.available_cash == pytest.approx(90000)
+        await broker.sell('000001.XSHE', 1000, price=10.0)
+        assert broker.available_cash == pytest.approx(100000)